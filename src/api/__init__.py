@@ -1,3 +1,3 @@
-from .routes import router
+from .routes import router, close_services
 
-__all__ = ["router"]
+__all__ = ["router", "close_services"]
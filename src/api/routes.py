@@ -3,113 +3,191 @@ API Routes for ExposeChain
 Async endpoints with rate limiting and AI analysis (No Database)
 """
 import asyncio
-import uuid
+import hashlib
+import time
 import logging
+import orjson
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
+from src.config import settings
 from src.models import ScanRequest, ScanResponse
 from src.utils import detect_target_type
 from src.services import DNSService, WHOISService, GeolocationService, SSLService, AIRiskPredictor
 from src.utils.rate_limiter import limiter
-from datetime import datetime
+from src.utils.cache import LookupCache, get_cache_stats, single_flight
+from src.utils.ids import uuid7
+from datetime import datetime, timezone
+from typing import Any, Dict
 
 logger = logging.getLogger("exposechain")
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 dns_service = DNSService()
 whois_service = WHOISService()
 geo_service = GeolocationService()
 ssl_service = SSLService()
 ai_predictor = AIRiskPredictor()
+scan_cache = LookupCache("scan", settings.SCAN_CACHE_MAXSIZE, settings.SCAN_CACHE_TTL)
+
+# Static payload for /api, built once at import
+API_INFO = {
+    "name": "ExposeChain API",
+    "version": "1.0.0",
+    "description": "AI-Powered Attack Surface & Threat Intelligence Platform",
+    "endpoints": {
+        "health": "/health",
+        "scan": "/api/scan",
+        "dns_lookup": "/api/dns/{domain}",
+        "whois_lookup": "/api/whois/{domain}",
+        "ssl_check": "/api/ssl/{domain}",
+        "geo_lookup": "/api/geo/{ip}",
+        "cache_stats": "/api/cache/stats",
+        "history": "/api/history",
+        "report": "/api/report/{scan_id}"
+    }
+}
+API_INFO_JSON = orjson.dumps(API_INFO)
+
+# (epoch second, encoded body) for /health, rebuilt at most once per second
+_health_body = (0, b"")
+
+
+async def close_services():
+    """Release pooled network clients held by the service singletons"""
+    await geo_service.aclose()
 
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "service": "ExposeChain"
-    }
+    global _health_body
+    now = int(time.time())
+    if _health_body[0] != now:
+        _health_body = (now, orjson.dumps({
+            "status": "healthy",
+            "timestamp": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "service": "ExposeChain"
+        }))
+    return Response(content=_health_body[1], media_type="application/json")
 
 
 @router.get("/api")
 async def api_info():
     """API information endpoint"""
-    return {
-        "name": "ExposeChain API",
-        "version": "1.0.0",
-        "description": "AI-Powered Attack Surface & Threat Intelligence Platform",
-        "endpoints": {
-            "health": "/health",
-            "scan": "/api/scan",
-            "dns_lookup": "/api/dns/{domain}",
-            "whois_lookup": "/api/whois/{domain}",
-            "ssl_check": "/api/ssl/{domain}",
-            "geo_lookup": "/api/geo/{ip}",
-            "history": "/api/history",
-            "report": "/api/report/{scan_id}"
-        }
-    }
+    return Response(content=API_INFO_JSON, media_type="application/json")
 
 
-@router.post("/api/scan", response_model=ScanResponse)
-@limiter.limit("10/minute")
-async def scan_target(request: Request, scan_request: ScanRequest):
+@router.get("/api/cache/stats")
+@limiter.limit("20/minute")
+async def cache_stats(request: Request):
+    """Lookup cache sizes and hit ratios (only when CACHE_STATS_ENABLED)"""
+    if not settings.CACHE_STATS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"caches": get_cache_stats()}
+
+
+async def _run_scan(target: str, scan_type: str) -> Dict[str, Any]:
     """
-    Main scanning endpoint with DNS, WHOIS, Geolocation, SSL, and AI Analysis.
-    Runs DNS, WHOIS, and SSL lookups in parallel for faster results.
+    Run the full DNS/WHOIS/SSL/geolocation/AI pipeline for one target.
+    WHOIS and SSL run alongside DNS, and geolocation starts as soon as DNS returns.
+    Concurrent scans of the same target share each in-flight lookup.
     """
-    try:
-        target_type = detect_target_type(scan_request.target)
+    started_at = datetime.now(timezone.utc)
+    target_type = detect_target_type(target)
 
-        scan_data = {
-            "scan_initiated": datetime.utcnow().isoformat(),
-            "scan_type": scan_request.scan_type,
-        }
+    scan_data = {
+        "scan_initiated": started_at,  # serialized by orjson
+        "scan_type": scan_type,
+    }
 
-        # Run DNS, WHOIS, and SSL lookups in parallel
-        dns_results, whois_results, ssl_results = await asyncio.gather(
-            asyncio.to_thread(dns_service.comprehensive_dns_lookup, scan_request.target, target_type),
-            asyncio.to_thread(whois_service.lookup_whois, scan_request.target),
-            asyncio.to_thread(ssl_service.get_certificate, scan_request.target),
-        )
+    # WHOIS and SSL only need the hostname, so start them right away
+    whois_task = asyncio.create_task(single_flight(
+        ("whois", target), lambda: asyncio.to_thread(whois_service.lookup_whois, target)
+    ))
+    ssl_task = asyncio.create_task(single_flight(
+        ("ssl", target), lambda: ssl_service.get_certificate(target)
+    ))
 
+    try:
+        dns_results = await single_flight(
+            ("dns", target, target_type),
+            lambda: dns_service.comprehensive_dns_lookup(target, target_type)
+        )
         scan_data["dns_lookup"] = dns_results
 
-        # Geolocation depends on DNS results, run after DNS
-        geo_results = await asyncio.to_thread(geo_service.lookup_domain_ips, dns_results)
-        if geo_results.get('total_ips', 0) > 0:
-            scan_data["geolocation"] = geo_results
-            scan_data["hosting_analysis"] = geo_service.analyze_hosting_pattern(geo_results)
+        # Geolocation depends on DNS results; overlap it with WHOIS/SSL still in flight
+        geo_results, whois_results, ssl_results = await asyncio.gather(
+            geo_service.lookup_domain_ips(dns_results), whois_task, ssl_task
+        )
+    finally:
+        whois_task.cancel()
+        ssl_task.cancel()
 
-        scan_data["ssl_certificate"] = ssl_results
-        if ssl_results.get("success"):
-            scan_data["ssl_security_analysis"] = ssl_service.analyze_certificate_security(ssl_results)
-            scan_data["hostname_validation"] = ssl_service.check_hostname_match(scan_request.target, ssl_results)
+    if geo_results.get('total_ips', 0) > 0:
+        scan_data["geolocation"] = geo_results
+        scan_data["hosting_analysis"] = geo_service.analyze_hosting_pattern(geo_results)
 
-        scan_data["whois_lookup"] = whois_results
-        if whois_results.get("success"):
-            scan_data["domain_analysis"] = whois_service.analyze_domain_status(whois_results)
+    scan_data["ssl_certificate"] = ssl_results
+    if ssl_results.get("success"):
+        scan_data["ssl_security_analysis"] = ssl_service.analyze_certificate_security(ssl_results)
+        scan_data["hostname_validation"] = ssl_service.check_hostname_match(target, ssl_results)
+
+    scan_data["whois_lookup"] = whois_results
+    if whois_results.get("success"):
+        scan_data["domain_analysis"] = whois_service.analyze_domain_status(whois_results)
+
+    # AI Risk Analysis
+    ai_analysis = ai_predictor.analyze(scan_data)
+    scan_data["ai_analysis"] = ai_analysis
 
-        # AI Risk Analysis
-        ai_analysis = ai_predictor.analyze(scan_data)
-        scan_data["ai_analysis"] = ai_analysis
+    # Generate scan ID (for reference, but not saved anywhere)
+    scan_id = str(uuid7())
+    scan_data["scan_id"] = scan_id
 
-        # Generate scan ID (for reference, but not saved anywhere)
-        scan_id = str(uuid.uuid4())
-        scan_data["scan_id"] = scan_id
+    logger.info("Scan completed: id=%s target=%s", scan_id, target)
+    return scan_data
 
-        message = f"Complete security scan finished for domain: {scan_request.target}"
 
-        logger.info("Scan completed: id=%s target=%s", scan_id, scan_request.target)
+@router.post("/api/scan", response_model=ScanResponse)
+@limiter.limit("10/minute")
+async def scan_target(request: Request, scan_request: ScanRequest):
+    """
+    Main scanning endpoint with DNS, WHOIS, Geolocation, SSL, and AI Analysis.
+    Recent results are replayed from the scan cache (see SCAN_CACHE_MODE), and
+    concurrent requests for the same scan share one pipeline run.
+    """
+    cache_mode = settings.SCAN_CACHE_MODE
+    cache_key = hashlib.sha256(
+        f"{scan_request.target}|{scan_request.scan_type}".encode("utf-8")
+    ).hexdigest()
 
-        return ScanResponse(
+    scan_data = scan_cache.get(cache_key) if cache_mode != "disabled" else None
+    if scan_data is None and cache_mode == "replay":
+        raise HTTPException(status_code=404, detail="No cached scan available for this target.")
+
+    try:
+        if scan_data is None:
+            scan_data = await single_flight(
+                ("scan", cache_key),
+                lambda: _run_scan(scan_request.target, scan_request.scan_type)
+            )
+            if cache_mode == "enabled":
+                # SSL failures may be transient, so those scans are only kept briefly
+                ttl = None if scan_data["ssl_certificate"].get("success") else settings.NEGATIVE_CACHE_TTL
+                scan_cache.set(cache_key, scan_data, ttl=ttl)
+        else:
+            logger.info("Scan cache hit: id=%s target=%s", scan_data["scan_id"], scan_request.target)
+
+        response = ScanResponse(
             success=True,
             target=scan_request.target,
-            target_type=target_type,
-            message=message,
+            target_type=detect_target_type(scan_request.target),
+            message=f"Complete security scan finished for domain: {scan_request.target}",
             data=scan_data
         )
+        # Already validated above; returning the response directly skips FastAPI
+        # re-validating and re-encoding the (large) payload against response_model
+        return ORJSONResponse(response.model_dump())
 
     except Exception as e:
         logger.error("Scan failed for target %s: %s", scan_request.target, str(e), exc_info=True)
@@ -125,7 +203,7 @@ async def dns_lookup(request: Request, target: str):
     """Dedicated DNS lookup endpoint"""
     try:
         target_type = detect_target_type(target)
-        results = await asyncio.to_thread(dns_service.comprehensive_dns_lookup, target, target_type)
+        results = await dns_service.comprehensive_dns_lookup(target, target_type)
         return {"success": True, "results": results}
     except Exception as e:
         logger.error("DNS lookup failed for %s: %s", target, str(e), exc_info=True)
@@ -164,7 +242,7 @@ async def whois_lookup(request: Request, domain: str):
 async def ssl_certificate_check(request: Request, domain: str, port: int = 443):
     """Dedicated SSL certificate check endpoint"""
     try:
-        cert_data = await asyncio.to_thread(ssl_service.get_certificate, domain, port)
+        cert_data = await ssl_service.get_certificate(domain, port)
 
         security_analysis = None
         hostname_validation = None
@@ -188,4 +266,4 @@ async def ssl_certificate_check(request: Request, domain: str, port: int = 443):
 
 
 # Database endpoints removed - no persistence needed
-# Scans return fresh results every time
+# Scan results are only kept in the in-memory scan cache (SCAN_CACHE_TTL)
@@ -1,8 +1,9 @@
 """
 Configuration settings for ExposeChain
 """
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, List, Union
+from typing import Optional, List, Literal, Union
 import os
 
 
@@ -27,10 +28,33 @@ class Settings(BaseSettings):
 
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
+    # memory:// is per process; point at redis:// so all workers share counters
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STRATEGY: Literal["fixed-window", "moving-window", "sliding-window-counter"] = "moving-window"
+
+    # Worker threads for blocking lookups (WHOIS); these are I/O-bound
+    BLOCKING_IO_WORKERS: int = 64
 
     # MaxMind GeoIP Database Path
     GEOIP_DB_PATH: Optional[str] = "./data/GeoLite2-City.mmdb"
 
+    # Lookup caching (TTLs in seconds; DNS entries expire on the lowest record TTL, capped here)
+    CACHE_MAXSIZE: int = 10000
+    DNS_CACHE_TTL: int = 300
+    WHOIS_CACHE_TTL: int = 86400
+    GEO_CACHE_TTL: int = 86400
+    SSL_CACHE_TTL: int = 3600
+    NEGATIVE_CACHE_TTL: int = 30  # failed lookups, so broken targets don't hammer upstreams
+    # /api/cache/stats exposes internal cache sizes and hit ratios, so it is off by default
+    CACHE_STATS_ENABLED: bool = False
+
+    # Full /api/scan result cache: enabled, read-only (serve hits, never store),
+    # replay (serve hits, 404 on miss) or disabled
+    SCAN_CACHE_MODE: Literal["enabled", "read-only", "replay", "disabled"] = "enabled"
+    SCAN_CACHE_TTL: int = 300
+    # Entries are whole scan payloads, so keep this far below CACHE_MAXSIZE
+    SCAN_CACHE_MAXSIZE: int = 256
+
     def get_cors_origins_list(self) -> List[str]:
         """Parse CORS_ORIGINS string to list"""
         if isinstance(self.CORS_ORIGINS, str):
@@ -38,5 +62,11 @@ class Settings(BaseSettings):
         return []
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide Settings instance (env and .env are parsed once)"""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
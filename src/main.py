@@ -2,12 +2,17 @@
 ExposeChain - Main Application
 AI-Powered Attack Surface & Threat Intelligence Platform
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
-from src.api import router
+from src.api import router, close_services
 from src.config import settings
 from src.utils.logging_config import setup_logging
 from src.utils.rate_limiter import limiter
@@ -17,13 +22,29 @@ from slowapi.errors import RateLimitExceeded
 # Setup logging
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open/close shared service resources around the app lifetime"""
+    # Size the pools used by asyncio.to_thread and Starlette's threadpool
+    executor = ThreadPoolExecutor(max_workers=settings.BLOCKING_IO_WORKERS, thread_name_prefix="exposechain-io")
+    asyncio.get_running_loop().set_default_executor(executor)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.BLOCKING_IO_WORKERS
+    yield
+    await close_services()
+    # Don't wait on WHOIS lookups still queued or running at shutdown
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     description="AI-Powered Attack Surface & Threat Intelligence Platform",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Register rate limiter
@@ -39,6 +60,9 @@ app.add_middleware(
     allow_headers=["Content-Type"],
 )
 
+# Compress larger responses (scan payloads are tens of KB of JSON)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Mount static files if directory exists
 static_path = Path("static")
 if static_path.exists():
@@ -49,15 +73,17 @@ if static_path.exists():
 app.include_router(router)
 
 
-# Serve the frontend
+# Serve the frontend (streamed from disk; existence checked once at startup)
+template_path = Path("templates/index.html")
+has_template = template_path.exists()
+
+
 @app.get("/", response_class=HTMLResponse, include_in_schema=False)
 async def serve_frontend():
     """Serve the web interface"""
-    template_path = Path("templates/index.html")
-    if template_path.exists():
-        with open(template_path, "r", encoding="utf-8") as f:
-            return f.read()
-    return "<h1>ExposeChain API</h1><p>Frontend template not found. Visit <a href='/docs'>/docs</a> for API documentation.</p>"
+    if has_template:
+        return FileResponse(template_path, media_type="text/html")
+    return HTMLResponse("<h1>ExposeChain API</h1><p>Frontend template not found. Visit <a href='/docs'>/docs</a> for API documentation.</p>")
 
 
 if __name__ == "__main__":
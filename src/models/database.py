@@ -3,7 +3,7 @@ Supabase PostgreSQL database setup using SQLAlchemy for scan history
 """
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy import create_engine, Column, String, DateTime, Integer, JSON
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import NullPool
@@ -25,6 +25,11 @@ SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
 
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime (the timestamp columns are naive UTC)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class ScanRecord(Base):
     """Model for storing scan history"""
     __tablename__ = "scan_records"
@@ -38,8 +43,8 @@ class ScanRecord(Base):
     geolocation_results = Column(JSON, nullable=True)
     ssl_results = Column(JSON, nullable=True)
     ai_analysis = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=_utcnow, nullable=False)
+    updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
 
     def to_dict(self):
         """Convert record to dictionary"""
@@ -1,10 +1,9 @@
 """
 Pydantic models for input validation
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Literal
-import validators
-from src.utils.validators import validate_target_not_internal
+from src.utils.validators import is_valid_domain, validate_target_not_internal
 
 
 class ScanRequest(BaseModel):
@@ -16,13 +15,23 @@ class ScanRequest(BaseModel):
         description="Scan depth: quick or full"
     )
 
-    @validator("target")
-    def validate_target(cls, v):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "target": "example.com",
+                "scan_type": "quick"
+            }
+        }
+    )
+
+    @field_validator("target")
+    @classmethod
+    def validate_target(cls, v: str) -> str:
         """Validate if input is a valid domain name"""
         v = v.strip().lower()
 
         # Check if it's a valid domain
-        if validators.domain(v):
+        if is_valid_domain(v):
             # SSRF protection - block internal/private IPs
             validate_target_not_internal(v)
             return v
@@ -32,26 +41,12 @@ class ScanRequest(BaseModel):
             f"Invalid target: '{v}'. Must be a valid domain name (e.g., example.com)."
         )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "target": "example.com",
-                "scan_type": "quick"
-            }
-        }
-
 
 class ScanResponse(BaseModel):
     """Response model for scan results"""
 
-    success: bool
-    target: str
-    target_type: Literal["domain"] = "domain"
-    message: str
-    data: dict = {}
-
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "success": True,
                 "target": "example.com",
@@ -60,3 +55,10 @@ class ScanResponse(BaseModel):
                 "data": {}
             }
         }
+    )
+
+    success: bool
+    target: str
+    target_type: Literal["domain"] = "domain"
+    message: str
+    data: dict = {}
@@ -13,12 +13,19 @@ The model extracts features from scan data across 4 dimensions:
 Each feature contributes a weighted score. The aggregate determines
 the threat category and confidence level.
 """
+import bisect
+import heapq
 import logging
+from operator import itemgetter
 from typing import Dict, Any, List, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
+from src.services.ssl_service import OUTDATED_PROTOCOLS
 
 logger = logging.getLogger("exposechain")
 
+# Ranking key for risk factors
+_factor_points = itemgetter("points")
+
 
 class AIRiskPredictor:
     """
@@ -50,6 +57,89 @@ class AIRiskPredictor:
         "dns_mx_present": 0.03,
     }
 
+    # Risk points for each fixed-threshold rule (rule severity x dimension weight)
+    POINTS = {
+        "very_new_domain": 100 * WEIGHTS["domain_age"],
+        "new_domain": 60 * WEIGHTS["domain_age"],
+        "young_domain": 20 * WEIGHTS["domain_age"],
+        "unknown_domain_age": 40 * WEIGHTS["domain_age"],
+        "domain_expired": 100 * WEIGHTS["domain_expiration"],
+        "domain_expires_30d": 70 * WEIGHTS["domain_expiration"],
+        "domain_expires_90d": 30 * WEIGHTS["domain_expiration"],
+        "whois_privacy": 40 * WEIGHTS["domain_privacy"],
+        "no_ssl": 100 * WEIGHTS["ssl_present"],
+        "outdated_protocol": 100 * WEIGHTS["ssl_protocol"],
+        "ssl_expires_7d": 80 * WEIGHTS["ssl_expiry"],
+        "ssl_expires_30d": 40 * WEIGHTS["ssl_expiry"],
+        "no_spf": 60 * WEIGHTS["dns_spf"],
+        "no_dmarc": 50 * WEIGHTS["dns_dmarc"],
+        "no_mx": 30 * WEIGHTS["dns_mx_present"],
+    }
+
+    # Factor records for the fixed-threshold rules, built once and copied per scan
+    FACTORS = {
+        "very_new_domain": {
+            "factor": "Very new domain (< 30 days)",
+            "points": round(POINTS["very_new_domain"], 1),
+            "severity": "high",
+        },
+        "new_domain": {
+            "factor": "Relatively new domain (< 6 months)",
+            "points": round(POINTS["new_domain"], 1),
+            "severity": "medium",
+        },
+        "young_domain": {
+            "factor": "Domain less than 1 year old",
+            "points": round(POINTS["young_domain"], 1),
+            "severity": "low",
+        },
+        "unknown_domain_age": {
+            "factor": "Domain age unknown (WHOIS data unavailable)",
+            "points": round(POINTS["unknown_domain_age"], 1),
+            "severity": "medium",
+        },
+        "domain_expired": {
+            "factor": "Domain has EXPIRED",
+            "points": round(POINTS["domain_expired"], 1),
+            "severity": "critical",
+        },
+        "domain_expires_30d": {
+            "factor": "Domain expires within 30 days",
+            "points": round(POINTS["domain_expires_30d"], 1),
+            "severity": "high",
+        },
+        "domain_expires_90d": {
+            "factor": "Domain expires within 90 days",
+            "points": round(POINTS["domain_expires_90d"], 1),
+            "severity": "medium",
+        },
+        "whois_privacy": {
+            "factor": "WHOIS privacy enabled (common for both legit and malicious)",
+            "points": round(POINTS["whois_privacy"], 1),
+            "severity": "low",
+        },
+        "no_ssl": {
+            "factor": "No SSL/TLS certificate detected",
+            "points": round(POINTS["no_ssl"], 1),
+            "severity": "high",
+        },
+        "no_spf": {
+            "factor": "No SPF record (email spoofing possible)",
+            "points": round(POINTS["no_spf"], 1),
+            "severity": "medium",
+        },
+        "no_dmarc": {
+            "factor": "No DMARC record (email authentication missing)",
+            "points": round(POINTS["no_dmarc"], 1),
+            "severity": "low",
+        },
+        "no_mx": {
+            "factor": "No MX records (no email infrastructure)",
+            "points": round(POINTS["no_mx"], 1),
+            "severity": "low",
+        },
+    }
+
     # Threat categories with score ranges
     CATEGORIES = {
         "legitimate": {"min_score": 0, "max_score": 20, "label": "Legitimate"},
@@ -58,6 +148,14 @@ class AIRiskPredictor:
         "phishing": {"min_score": 76, "max_score": 100, "label": "Likely Phishing / Malicious"},
     }
 
+    # Category names and their inclusive upper score bounds (the last is open-ended)
+    CATEGORY_ORDER = tuple(CATEGORIES)
+    CATEGORY_BOUNDS = tuple(c["max_score"] for c in CATEGORIES.values())[:-1]
+
+    # Risk levels and their inclusive upper score bounds
+    RISK_LEVELS = ("low", "medium", "high", "critical")
+    RISK_LEVEL_BOUNDS = (20, 45, 70)
+
     def analyze(self, scan_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Main entry point: analyze scan data and produce threat assessment.
@@ -78,12 +176,7 @@ class AIRiskPredictor:
         assessment = self._generate_assessment(score, category, features, factors)
         recommendations = self._generate_recommendations(score, category, features)
 
-        risk_level = (
-            "low" if score <= 20
-            else "medium" if score <= 45
-            else "high" if score <= 70
-            else "critical"
-        )
+        risk_level = self.RISK_LEVELS[bisect.bisect_left(self.RISK_LEVEL_BOUNDS, score)]
 
         result = {
             "overall_risk_score": score,
@@ -95,7 +188,7 @@ class AIRiskPredictor:
             "summary": assessment,  # Frontend expects summary
             "features": features,
             "model_version": "1.0.0",
-            "analyzed_at": datetime.utcnow().isoformat(),
+            "analyzed_at": datetime.now(timezone.utc).isoformat(),
         }
 
         logger.info(
@@ -148,8 +241,7 @@ class AIRiskPredictor:
 
         # Check for proxy/VPN in geo data
         proxy_count = 0
-        ip_locations = geo.get("ip_locations", {})
-        for ip, loc in ip_locations.items():
+        for loc in geo.get("ip_locations", {}).values():
             if loc.get("success") and loc.get("flags", {}).get("is_proxy"):
                 proxy_count += 1
         features["proxy_count"] = proxy_count
@@ -160,13 +252,19 @@ class AIRiskPredictor:
         features["dns_a_count"] = dns_records.get("A", {}).get("count", 0)
         features["dns_mx_present"] = dns_records.get("MX", {}).get("success", False)
         features["dns_ns_count"] = dns_records.get("NS", {}).get("count", 0)
-        features["dns_txt_count"] = dns_records.get("TXT", {}).get("count", 0)
-
-        # Check for SPF and DMARC in TXT records
-        txt_records = dns_records.get("TXT", {}).get("records", [])
-        txt_data = " ".join(r.get("data", "") for r in txt_records).lower()
-        features["has_spf"] = "v=spf1" in txt_data
-        features["has_dmarc"] = "_dmarc" in txt_data or "v=dmarc1" in txt_data
+        txt = dns_records.get("TXT", {})
+        features["dns_txt_count"] = txt.get("count", 0)
+
+        # Check for SPF and DMARC in TXT records (one pass, stops once both are found)
+        has_spf = has_dmarc = False
+        for record in txt.get("records", []):
+            txt_data = (record.get("data") or "").lower()
+            has_spf = has_spf or "v=spf1" in txt_data
+            has_dmarc = has_dmarc or "_dmarc" in txt_data or "v=dmarc1" in txt_data
+            if has_spf and has_dmarc:
+                break
+        features["has_spf"] = has_spf
+        features["has_dmarc"] = has_dmarc
 
         return features
 
@@ -179,86 +277,41 @@ class AIRiskPredictor:
         age = features.get("domain_age_days")
         if age is not None:
             if age < 30:
-                pts = 100 * self.WEIGHTS["domain_age"]
-                raw_score += pts
-                factors.append({
-                    "factor": "Very new domain (< 30 days)",
-                    "points": round(pts, 1),
-                    "severity": "high"
-                })
+                raw_score += self.POINTS["very_new_domain"]
+                factors.append(self.FACTORS["very_new_domain"].copy())
             elif age < 180:
-                pts = 60 * self.WEIGHTS["domain_age"]
-                raw_score += pts
-                factors.append({
-                    "factor": "Relatively new domain (< 6 months)",
-                    "points": round(pts, 1),
-                    "severity": "medium"
-                })
+                raw_score += self.POINTS["new_domain"]
+                factors.append(self.FACTORS["new_domain"].copy())
             elif age < 365:
-                pts = 20 * self.WEIGHTS["domain_age"]
-                raw_score += pts
-                factors.append({
-                    "factor": "Domain less than 1 year old",
-                    "points": round(pts, 1),
-                    "severity": "low"
-                })
+                raw_score += self.POINTS["young_domain"]
+                factors.append(self.FACTORS["young_domain"].copy())
             # age > 365: established domain, no risk points
         else:
-            pts = 40 * self.WEIGHTS["domain_age"]
-            raw_score += pts
-            factors.append({
-                "factor": "Domain age unknown (WHOIS data unavailable)",
-                "points": round(pts, 1),
-                "severity": "medium"
-            })
+            raw_score += self.POINTS["unknown_domain_age"]
+            factors.append(self.FACTORS["unknown_domain_age"].copy())
 
         # --- Domain expiration ---
         exp = features.get("days_until_expiration")
         if exp is not None:
             if exp < 0:
-                pts = 100 * self.WEIGHTS["domain_expiration"]
-                raw_score += pts
-                factors.append({
-                    "factor": "Domain has EXPIRED",
-                    "points": round(pts, 1),
-                    "severity": "critical"
-                })
+                raw_score += self.POINTS["domain_expired"]
+                factors.append(self.FACTORS["domain_expired"].copy())
             elif exp < 30:
-                pts = 70 * self.WEIGHTS["domain_expiration"]
-                raw_score += pts
-                factors.append({
-                    "factor": "Domain expires within 30 days",
-                    "points": round(pts, 1),
-                    "severity": "high"
-                })
+                raw_score += self.POINTS["domain_expires_30d"]
+                factors.append(self.FACTORS["domain_expires_30d"].copy())
             elif exp < 90:
-                pts = 30 * self.WEIGHTS["domain_expiration"]
-                raw_score += pts
-                factors.append({
-                    "factor": "Domain expires within 90 days",
-                    "points": round(pts, 1),
-                    "severity": "medium"
-                })
+                raw_score += self.POINTS["domain_expires_90d"]
+                factors.append(self.FACTORS["domain_expires_90d"].copy())
 
         # --- Privacy protection ---
         if features.get("has_privacy_protection"):
-            pts = 40 * self.WEIGHTS["domain_privacy"]
-            raw_score += pts
-            factors.append({
-                "factor": "WHOIS privacy enabled (common for both legit and malicious)",
-                "points": round(pts, 1),
-                "severity": "low"
-            })
+            raw_score += self.POINTS["whois_privacy"]
+            factors.append(self.FACTORS["whois_privacy"].copy())
 
         # --- SSL presence ---
         if not features.get("ssl_present"):
-            pts = 100 * self.WEIGHTS["ssl_present"]
-            raw_score += pts
-            factors.append({
-                "factor": "No SSL/TLS certificate detected",
-                "points": round(pts, 1),
-                "severity": "high"
-            })
+            raw_score += self.POINTS["no_ssl"]
+            factors.append(self.FACTORS["no_ssl"].copy())
 
         # --- SSL score deficit ---
         ssl_score = features.get("ssl_score")
@@ -275,8 +328,8 @@ class AIRiskPredictor:
 
         # --- SSL protocol version ---
         proto = features.get("ssl_protocol", "")
-        if proto in ["SSLv2", "SSLv3", "TLSv1", "TLSv1.1"]:
-            pts = 100 * self.WEIGHTS["ssl_protocol"]
+        if proto in OUTDATED_PROTOCOLS:
+            pts = self.POINTS["outdated_protocol"]
             raw_score += pts
             factors.append({
                 "factor": f"Outdated SSL/TLS protocol: {proto}",
@@ -287,7 +340,7 @@ class AIRiskPredictor:
         # --- SSL expiry ---
         ssl_days = features.get("ssl_days_left")
         if ssl_days is not None and ssl_days < 7:
-            pts = 80 * self.WEIGHTS["ssl_expiry"]
+            pts = self.POINTS["ssl_expires_7d"]
             raw_score += pts
             factors.append({
                 "factor": f"SSL certificate expires in {ssl_days} days",
@@ -295,7 +348,7 @@ class AIRiskPredictor:
                 "severity": "high"
             })
         elif ssl_days is not None and ssl_days < 30:
-            pts = 40 * self.WEIGHTS["ssl_expiry"]
+            pts = self.POINTS["ssl_expires_30d"]
             raw_score += pts
             factors.append({
                 "factor": f"SSL certificate expires in {ssl_days} days",
@@ -316,33 +369,18 @@ class AIRiskPredictor:
 
         # --- No SPF record ---
         if not features.get("has_spf"):
-            pts = 60 * self.WEIGHTS["dns_spf"]
-            raw_score += pts
-            factors.append({
-                "factor": "No SPF record (email spoofing possible)",
-                "points": round(pts, 1),
-                "severity": "medium"
-            })
+            raw_score += self.POINTS["no_spf"]
+            factors.append(self.FACTORS["no_spf"].copy())
 
         # --- No DMARC record ---
         if not features.get("has_dmarc"):
-            pts = 50 * self.WEIGHTS["dns_dmarc"]
-            raw_score += pts
-            factors.append({
-                "factor": "No DMARC record (email authentication missing)",
-                "points": round(pts, 1),
-                "severity": "low"
-            })
+            raw_score += self.POINTS["no_dmarc"]
+            factors.append(self.FACTORS["no_dmarc"].copy())
 
         # --- No MX records ---
         if not features.get("dns_mx_present"):
-            pts = 30 * self.WEIGHTS["dns_mx_present"]
-            raw_score += pts
-            factors.append({
-                "factor": "No MX records (no email infrastructure)",
-                "points": round(pts, 1),
-                "severity": "low"
-            })
+            raw_score += self.POINTS["no_mx"]
+            factors.append(self.FACTORS["no_mx"].copy())
 
         final_score = min(100, max(0, round(raw_score)))
         return final_score, factors
@@ -361,14 +399,7 @@ class AIRiskPredictor:
             return "malware_hosting"
 
         # Score-based classification
-        if score <= 20:
-            return "legitimate"
-        elif score <= 50:
-            return "suspicious"
-        elif score <= 75:
-            return "malware_hosting"
-        else:
-            return "phishing"
+        return self.CATEGORY_ORDER[bisect.bisect_left(self.CATEGORY_BOUNDS, score)]
 
     def _calculate_confidence(self, features: Dict) -> float:
         """Calculate confidence score based on data completeness (0.0-1.0)"""
@@ -400,9 +431,8 @@ class AIRiskPredictor:
         parts.append(f"The overall threat risk score is {score}/100.")
 
         # Add top contributing factors
-        sorted_factors = sorted(factors, key=lambda f: f["points"], reverse=True)
-        if sorted_factors:
-            top = sorted_factors[:3]
+        if factors:
+            top = heapq.nlargest(3, factors, key=_factor_points)
             factor_strs = [f["factor"] for f in top]
             parts.append("Key contributing factors: " + "; ".join(factor_strs) + ".")
 
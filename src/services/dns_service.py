@@ -2,13 +2,16 @@
 DNS Lookup Service for ExposeChain
 Handles DNS queries and analysis
 """
+import asyncio
+import dns.asyncresolver
 import dns.resolver
 import dns.reversename
 import time
 import logging
 from typing import Dict, List, Optional, Any
-from datetime import datetime
-from cachetools import TTLCache
+from datetime import datetime, timezone
+from src.config import settings
+from src.utils.cache import LookupCache
 
 logger = logging.getLogger("exposechain")
 
@@ -17,14 +20,15 @@ class DNSService:
     """Service for DNS lookups and analysis"""
 
     def __init__(self):
-        self.resolver = dns.resolver.Resolver()
+        # Async resolver keeps lookups on the event loop instead of a worker thread
+        self.resolver = dns.asyncresolver.Resolver()
         # Use Google's DNS servers for reliability
         self.resolver.nameservers = ['8.8.8.8', '8.8.4.4']
         self.resolver.timeout = 5
         self.resolver.lifetime = 5
-        self._cache = TTLCache(maxsize=128, ttl=300)  # 5 min TTL
+        self._cache = LookupCache("dns", settings.CACHE_MAXSIZE, settings.DNS_CACHE_TTL)
     
-    def lookup_a_records(self, domain: str) -> Dict[str, Any]:
+    async def lookup_a_records(self, domain: str) -> Dict[str, Any]:
         """
         Get A (IPv4) records for a domain
         
@@ -36,7 +40,7 @@ class DNSService:
         """
         try:
             start_time = time.time()
-            answers = self.resolver.resolve(domain, 'A')
+            answers = await self.resolver.resolve(domain, 'A')
             query_time = round((time.time() - start_time) * 1000, 2)
             
             records = []
@@ -75,7 +79,7 @@ class DNSService:
                 "records": []
             }
     
-    def lookup_aaaa_records(self, domain: str) -> Dict[str, Any]:
+    async def lookup_aaaa_records(self, domain: str) -> Dict[str, Any]:
         """
         Get AAAA (IPv6) records for a domain
         
@@ -87,7 +91,7 @@ class DNSService:
         """
         try:
             start_time = time.time()
-            answers = self.resolver.resolve(domain, 'AAAA')
+            answers = await self.resolver.resolve(domain, 'AAAA')
             query_time = round((time.time() - start_time) * 1000, 2)
             
             records = []
@@ -119,7 +123,7 @@ class DNSService:
                 "records": []
             }
     
-    def lookup_mx_records(self, domain: str) -> Dict[str, Any]:
+    async def lookup_mx_records(self, domain: str) -> Dict[str, Any]:
         """
         Get MX (Mail Exchange) records for a domain
         
@@ -131,7 +135,7 @@ class DNSService:
         """
         try:
             start_time = time.time()
-            answers = self.resolver.resolve(domain, 'MX')
+            answers = await self.resolver.resolve(domain, 'MX')
             query_time = round((time.time() - start_time) * 1000, 2)
             
             records = []
@@ -167,7 +171,7 @@ class DNSService:
                 "records": []
             }
     
-    def lookup_ns_records(self, domain: str) -> Dict[str, Any]:
+    async def lookup_ns_records(self, domain: str) -> Dict[str, Any]:
         """
         Get NS (Name Server) records for a domain
         
@@ -179,7 +183,7 @@ class DNSService:
         """
         try:
             start_time = time.time()
-            answers = self.resolver.resolve(domain, 'NS')
+            answers = await self.resolver.resolve(domain, 'NS')
             query_time = round((time.time() - start_time) * 1000, 2)
             
             records = []
@@ -211,7 +215,7 @@ class DNSService:
                 "records": []
             }
     
-    def lookup_txt_records(self, domain: str) -> Dict[str, Any]:
+    async def lookup_txt_records(self, domain: str) -> Dict[str, Any]:
         """
         Get TXT records for a domain
         
@@ -223,7 +227,7 @@ class DNSService:
         """
         try:
             start_time = time.time()
-            answers = self.resolver.resolve(domain, 'TXT')
+            answers = await self.resolver.resolve(domain, 'TXT')
             query_time = round((time.time() - start_time) * 1000, 2)
             
             records = []
@@ -257,7 +261,7 @@ class DNSService:
                 "records": []
             }
     
-    def reverse_dns_lookup(self, ip_address: str) -> Dict[str, Any]:
+    async def reverse_dns_lookup(self, ip_address: str) -> Dict[str, Any]:
         """
         Perform reverse DNS lookup for an IP address
         
@@ -270,7 +274,7 @@ class DNSService:
         try:
             start_time = time.time()
             addr = dns.reversename.from_address(ip_address)
-            answers = self.resolver.resolve(addr, 'PTR')
+            answers = await self.resolver.resolve(addr, 'PTR')
             query_time = round((time.time() - start_time) * 1000, 2)
             
             hostnames = [str(rdata).rstrip('.') for rdata in answers]
@@ -289,7 +293,7 @@ class DNSService:
                 "hostnames": []
             }
     
-    def comprehensive_dns_lookup(self, target: str, target_type: str) -> Dict[str, Any]:
+    async def comprehensive_dns_lookup(self, target: str, target_type: str) -> Dict[str, Any]:
         """
         Perform comprehensive DNS lookup for a target
 
@@ -301,24 +305,28 @@ class DNSService:
             Dictionary with all DNS results
         """
         cache_key = f"dns:{target}:{target_type}"
-        if cache_key in self._cache:
+        cached = self._cache.get(cache_key)
+        if cached is not None:
             logger.debug("Cache hit for %s", cache_key)
-            return self._cache[cache_key]
+            return cached
 
         results = {
             "target": target,
             "target_type": target_type,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "dns_records": {}
         }
         
         if target_type == "domain":
-            # Query all record types for domains
-            results["dns_records"]["A"] = self.lookup_a_records(target)
-            results["dns_records"]["AAAA"] = self.lookup_aaaa_records(target)
-            results["dns_records"]["MX"] = self.lookup_mx_records(target)
-            results["dns_records"]["NS"] = self.lookup_ns_records(target)
-            results["dns_records"]["TXT"] = self.lookup_txt_records(target)
+            # Query all record types for domains concurrently
+            a, aaaa, mx, ns, txt = await asyncio.gather(
+                self.lookup_a_records(target),
+                self.lookup_aaaa_records(target),
+                self.lookup_mx_records(target),
+                self.lookup_ns_records(target),
+                self.lookup_txt_records(target),
+            )
+            results["dns_records"].update({"A": a, "AAAA": aaaa, "MX": mx, "NS": ns, "TXT": txt})
             
             # Calculate total query time
             total_time = sum([
@@ -332,7 +340,33 @@ class DNSService:
             
         elif target_type in ["ipv4", "ipv6"]:
             # Perform reverse DNS lookup for IP addresses
-            results["reverse_dns"] = self.reverse_dns_lookup(target)
+            results["reverse_dns"] = await self.reverse_dns_lookup(target)
 
-        self._cache[cache_key] = results
+        self._cache.set(cache_key, results, ttl=self._cache_ttl(results))
         return results
+
+    def _cache_ttl(self, results: Dict[str, Any]) -> int:
+        """
+        Cache lifetime for a lookup: the lowest record TTL in the answer,
+        capped at the configured DNS cache TTL (like a recursive resolver).
+        Lookups where nothing resolved are only kept for the negative TTL.
+
+        Args:
+            results: Output of comprehensive_dns_lookup
+
+        Returns:
+            TTL in seconds
+        """
+        record_sets = list(results.get("dns_records", {}).values())
+        if "reverse_dns" in results:
+            record_sets.append(results["reverse_dns"])
+        if not any(record_set.get("success") for record_set in record_sets):
+            return settings.NEGATIVE_CACHE_TTL
+
+        ttls = [
+            record["ttl"]
+            for record_set in results.get("dns_records", {}).values()
+            for record in record_set.get("records", [])
+            if "ttl" in record
+        ]
+        return min(ttls + [self._cache.ttl])
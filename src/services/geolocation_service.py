@@ -2,14 +2,19 @@
 Geolocation Service for ExposeChain
 Handles IP geolocation lookups using free public APIs
 """
-import requests
+import asyncio
+import httpx
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import time
-from cachetools import TTLCache
+from src.config import settings
+from src.utils.cache import LookupCache
 
 logger = logging.getLogger("exposechain")
 
+# ISP name fragments that indicate CDN / large cloud hosting
+CDN_KEYWORDS = ('cloudflare', 'akamai', 'fastly', 'amazon', 'google', 'microsoft', 'azure')
+
 
 class GeolocationService:
     """Service for IP geolocation lookups"""
@@ -19,9 +24,54 @@ class GeolocationService:
         # Limit: 45 requests per minute
         self.api_url = "http://ip-api.com/json/{ip}"
         self.timeout = 10
-        self._cache = TTLCache(maxsize=128, ttl=300)  # 5 min TTL
+        self._cache = LookupCache("geo", settings.CACHE_MAXSIZE, settings.GEO_CACHE_TTL)
+        # Created lazily (see _ensure_pool): both bind to the event loop that first uses them
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lookup_slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Clients left open by event loops that have stopped (released by aclose)
+        self._stale_clients: List[httpx.AsyncClient] = []
+
+    def _ensure_pool(self) -> None:
+        """(Re)create the HTTP client and lookup semaphore for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is not None and not self._client.is_closed and self._loop is not loop:
+            # Left over from another event loop: close it there while that loop still runs
+            if self._loop.is_running():
+                asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop)
+            else:
+                self._stale_clients.append(self._client)
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+            # Caps concurrent API calls across all scans (the free tier is rate limited)
+            self._lookup_slots = asyncio.Semaphore(10)
+            self._loop = loop
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, so lookups reuse pooled keep-alive connections"""
+        self._ensure_pool()
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and any left over from earlier event loops"""
+        clients, self._stale_clients = self._stale_clients, []
+        if self._client is not None:
+            clients.append(self._client)
+            self._client = None
+            self._lookup_slots = None
+            self._loop = None
+        for client in clients:
+            try:
+                await client.aclose()
+            except RuntimeError:
+                # Its event loop is already closed, so its connections can't be shut down cleanly
+                logger.debug("Pooled HTTP client outlived its event loop")
     
-    def lookup_ip_location(self, ip_address: str) -> Dict[str, Any]:
+    async def lookup_ip_location(self, ip_address: str) -> Dict[str, Any]:
         """
         Get geolocation information for an IP address
         
@@ -32,10 +82,18 @@ class GeolocationService:
             Dictionary with geolocation results
         """
         cache_key = f"geo:{ip_address}"
-        if cache_key in self._cache:
+        cached = self._cache.get(cache_key)
+        if cached is not None:
             logger.debug("Cache hit for %s", cache_key)
-            return self._cache[cache_key]
+            return cached
+
+        result = await self._fetch_ip_location(ip_address)
+        # Failures (including API rate limiting) are cached briefly
+        self._cache.set(cache_key, result, ttl=None if result["success"] else settings.NEGATIVE_CACHE_TTL)
+        return result
 
+    async def _fetch_ip_location(self, ip_address: str) -> Dict[str, Any]:
+        """Query the geolocation API for an IP address (uncached)"""
         try:
             # Query the API
             url = self.api_url.format(ip=ip_address)
@@ -46,7 +104,7 @@ class GeolocationService:
             }
             
             start_time = time.time()
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = await self.client.get(url, params=params)
             query_time = round((time.time() - start_time) * 1000, 2)
             
             if response.status_code == 200:
@@ -88,7 +146,6 @@ class GeolocationService:
                         "reverse_dns": data.get('reverse'),
                         "query_time_ms": query_time
                     }
-                    self._cache[cache_key] = result
                     return result
                 else:
                     # API returned failure status
@@ -106,7 +163,7 @@ class GeolocationService:
                     "query_time_ms": query_time
                 }
                 
-        except requests.Timeout:
+        except httpx.TimeoutException:
             return {
                 "success": False,
                 "ip": ip_address,
@@ -119,7 +176,7 @@ class GeolocationService:
                 "error": str(e)
             }
     
-    def lookup_domain_ips(self, dns_results: Dict[str, Any]) -> Dict[str, Any]:
+    async def lookup_domain_ips(self, dns_results: Dict[str, Any]) -> Dict[str, Any]:
         """
         Lookup geolocation for all IPs found in DNS results
         
@@ -129,29 +186,30 @@ class GeolocationService:
         Returns:
             Dictionary with geolocation for all IPs
         """
-        locations = {}
-        
-        # Get A records (IPv4)
-        a_records = dns_results.get('dns_records', {}).get('A', {})
-        if a_records.get('success'):
-            for record in a_records.get('records', []):
-                ip = record.get('ip')
-                if ip and ip not in locations:
-                    locations[ip] = self.lookup_ip_location(ip)
-        
-        # Get AAAA records (IPv6)
-        aaaa_records = dns_results.get('dns_records', {}).get('AAAA', {})
-        if aaaa_records.get('success'):
-            for record in aaaa_records.get('records', []):
-                ip = record.get('ip')
-                if ip and ip not in locations:
-                    locations[ip] = self.lookup_ip_location(ip)
-        
+        ips = []
+
+        # Collect IPs from A (IPv4) and AAAA (IPv6) records
+        for record_type in ('A', 'AAAA'):
+            record_set = dns_results.get('dns_records', {}).get(record_type, {})
+            if record_set.get('success'):
+                ips.extend(record.get('ip') for record in record_set.get('records', []) if record.get('ip'))
+
+        # Dedupe (keeping DNS order) and look the IPs up concurrently
+        ips = list(dict.fromkeys(ips))
+        results = await asyncio.gather(*(self._bounded_lookup(ip) for ip in ips))
+        locations = dict(zip(ips, results))
+
         return {
             "total_ips": len(locations),
             "ip_locations": locations
         }
     
+    async def _bounded_lookup(self, ip_address: str) -> Dict[str, Any]:
+        """lookup_ip_location, limited to a few API calls in flight at once"""
+        self._ensure_pool()
+        async with self._lookup_slots:
+            return await self.lookup_ip_location(ip_address)
+
     def analyze_hosting_pattern(self, geolocation_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze hosting patterns from geolocation data
@@ -175,7 +233,6 @@ class GeolocationService:
         isps = set()
         hosting_count = 0
         proxy_count = 0
-        cdn_keywords = ['cloudflare', 'akamai', 'fastly', 'amazon', 'google', 'microsoft', 'azure']
         is_cdn = False
         
         insights = []
@@ -197,7 +254,8 @@ class GeolocationService:
                 if isp:
                     isps.add(isp)
                     # Check for CDN
-                    if any(keyword in isp.lower() for keyword in cdn_keywords):
+                    isp_lower = isp.lower()
+                    if any(keyword in isp_lower for keyword in CDN_KEYWORDS):
                         is_cdn = True
                 
                 # Check flags
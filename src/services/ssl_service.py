@@ -2,6 +2,7 @@
 SSL Certificate Service for ExposeChain
 Handles SSL/TLS certificate validation and analysis
 """
+import asyncio
 import ssl
 import socket
 import logging
@@ -10,10 +11,14 @@ from typing import Dict, Any, Optional
 import OpenSSL
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
-from cachetools import TTLCache
+from src.config import settings
+from src.utils.cache import LookupCache
 
 logger = logging.getLogger("exposechain")
 
+# Protocol versions considered outdated (also used by the AI risk model)
+OUTDATED_PROTOCOLS = frozenset({"SSLv2", "SSLv3", "TLSv1", "TLSv1.1"})
+
 
 class SSLService:
     """Service for SSL/TLS certificate analysis"""
@@ -21,9 +26,11 @@ class SSLService:
     def __init__(self):
         self.timeout = 10
         self.default_port = 443
-        self._cache = TTLCache(maxsize=128, ttl=300)  # 5 min TTL
+        self._cache = LookupCache("ssl", settings.CACHE_MAXSIZE, settings.SSL_CACHE_TTL)
+        # Built once: loading the system CA store is the expensive part
+        self._context = ssl.create_default_context()
     
-    def get_certificate(self, hostname: str, port: int = None) -> Dict[str, Any]:
+    async def get_certificate(self, hostname: str, port: int = None) -> Dict[str, Any]:
         """
         Retrieve SSL certificate from a hostname
         
@@ -38,48 +45,57 @@ class SSLService:
             port = self.default_port
 
         cache_key = f"ssl:{hostname}:{port}"
-        if cache_key in self._cache:
+        cached = self._cache.get(cache_key)
+        if cached is not None:
             logger.debug("Cache hit for %s", cache_key)
-            return self._cache[cache_key]
+            return cached
+
+        result = await self._fetch_certificate(hostname, port)
+        # Failures are cached briefly so a dead target isn't re-queried on every scan
+        self._cache.set(cache_key, result, ttl=None if result["success"] else settings.NEGATIVE_CACHE_TTL)
+        return result
 
+    async def _fetch_certificate(self, hostname: str, port: int) -> Dict[str, Any]:
+        """Connect to hostname:port and read its certificate (uncached)"""
+        writer = None
         try:
-            # Create SSL context
-            context = ssl.create_default_context()
-            
-            # Connect and get certificate
-            with socket.create_connection((hostname, port), timeout=self.timeout) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    # Get certificate in DER format
-                    der_cert = ssock.getpeercert(binary_form=True)
-                    
-                    # Get certificate info
-                    cert_dict = ssock.getpeercert()
-                    
-                    # Get SSL/TLS version
-                    ssl_version = ssock.version()
-                    
-                    # Get cipher suite
-                    cipher = ssock.cipher()
-                    
-                    # Parse certificate with cryptography
-                    cert = x509.load_der_x509_certificate(der_cert, default_backend())
-                    
-                    result = {
-                        "success": True,
-                        "hostname": hostname,
-                        "port": port,
-                        "certificate": self._parse_certificate(cert, cert_dict),
-                        "ssl_version": ssl_version,
-                        "cipher_suite": {
-                            "name": cipher[0] if cipher else None,
-                            "protocol": cipher[1] if cipher else None,
-                            "bits": cipher[2] if cipher else None
-                        }
-                    }
-                    self._cache[cache_key] = result
-                    return result
-                    
-        except socket.timeout:
+            # Connect and handshake on the event loop (timeout bounds both)
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(hostname, port, ssl=self._context, server_hostname=hostname),
+                timeout=self.timeout
+            )
+            ssock = writer.get_extra_info("ssl_object")
+
+            # Get certificate in DER format
+            der_cert = ssock.getpeercert(binary_form=True)
+
+            # Get certificate info
+            cert_dict = ssock.getpeercert()
+
+            # Get SSL/TLS version
+            ssl_version = ssock.version()
+
+            # Get cipher suite
+            cipher = ssock.cipher()
+
+            # Parse certificate with cryptography
+            cert = x509.load_der_x509_certificate(der_cert, default_backend())
+
+            result = {
+                "success": True,
+                "hostname": hostname,
+                "port": port,
+                "certificate": self._parse_certificate(cert, cert_dict),
+                "ssl_version": ssl_version,
+                "cipher_suite": {
+                    "name": cipher[0] if cipher else None,
+                    "protocol": cipher[1] if cipher else None,
+                    "bits": cipher[2] if cipher else None
+                }
+            }
+            return result
+
+        except asyncio.TimeoutError:
             return {
                 "success": False,
                 "hostname": hostname,
@@ -107,6 +123,15 @@ class SSLService:
                 "port": port,
                 "error": str(e)
             }
+        finally:
+            if writer is not None:
+                writer.close()
+                # Let the TLS shutdown finish so the transport is released, without
+                # letting a peer that never answers close_notify stall the scan
+                try:
+                    await asyncio.wait_for(writer.wait_closed(), timeout=self.timeout)
+                except (OSError, ssl.SSLError, asyncio.TimeoutError):
+                    pass
     
     def _parse_certificate(self, cert: x509.Certificate, cert_dict: dict) -> Dict[str, Any]:
         """
@@ -265,7 +290,7 @@ class SSLService:
         
         # Check SSL/TLS version
         ssl_version = cert_data.get("ssl_version", "")
-        if ssl_version in ["SSLv2", "SSLv3", "TLSv1", "TLSv1.1"]:
+        if ssl_version in OUTDATED_PROTOCOLS:
             issues.append(f"Using outdated protocol: {ssl_version}")
             score -= 20
             recommendations.append("Upgrade to TLS 1.2 or TLS 1.3")
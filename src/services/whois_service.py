@@ -6,7 +6,8 @@ import whois
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
-from cachetools import TTLCache
+from src.config import settings
+from src.utils.cache import LookupCache
 
 logger = logging.getLogger("exposechain")
 
@@ -15,7 +16,7 @@ class WHOISService:
     """Service for WHOIS lookups and domain registration analysis"""
 
     def __init__(self):
-        self._cache = TTLCache(maxsize=128, ttl=300)  # 5 min TTL
+        self._cache = LookupCache("whois", settings.CACHE_MAXSIZE, settings.WHOIS_CACHE_TTL)
 
     def lookup_whois(self, domain: str) -> Dict[str, Any]:
         """
@@ -28,10 +29,18 @@ class WHOISService:
             Dictionary with WHOIS results
         """
         cache_key = f"whois:{domain}"
-        if cache_key in self._cache:
+        cached = self._cache.get(cache_key)
+        if cached is not None:
             logger.debug("Cache hit for %s", cache_key)
-            return self._cache[cache_key]
+            return cached
 
+        result = self._fetch_whois(domain)
+        # Failures are cached briefly so a dead target isn't re-queried on every scan
+        self._cache.set(cache_key, result, ttl=None if result["success"] else settings.NEGATIVE_CACHE_TTL)
+        return result
+
+    def _fetch_whois(self, domain: str) -> Dict[str, Any]:
+        """Query the WHOIS servers for a domain (uncached)"""
         try:
             # Perform WHOIS lookup
             w = whois.whois(domain)
@@ -66,7 +75,6 @@ class WHOISService:
             if result["expiration_date"]:
                 result["days_until_expiration"] = self._calculate_days_until(result["expiration_date"])
 
-            self._cache[cache_key] = result
             return result
             
         except Exception as e:
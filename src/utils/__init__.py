@@ -1,3 +1,3 @@
-from .validators import detect_target_type, is_valid_target, is_private_ip, validate_target_not_internal
+from .validators import detect_target_type, is_valid_domain, is_valid_target, is_private_ip, validate_target_not_internal
 
-__all__ = ["detect_target_type", "is_valid_target", "is_private_ip", "validate_target_not_internal"]
+__all__ = ["detect_target_type", "is_valid_domain", "is_valid_target", "is_private_ip", "validate_target_not_internal"]
@@ -0,0 +1,94 @@
+"""
+Lookup caching for ExposeChain
+TTL caches with hit/miss statistics shared by the lookup services
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+from cachetools import TLRUCache
+
+T = TypeVar("T")
+
+# All caches created in this process, by name (used for /api/cache/stats)
+_registry: Dict[str, "LookupCache"] = {}
+
+# Lookups currently running, per event loop and then by key (see single_flight);
+# futures must only be awaited on the loop that created them
+_inflight: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class LookupCache:
+    """
+    Thread-safe TTL cache that tracks hit/miss counts.
+
+    Every entry stores its own TTL, so a result can expire on the lifetime
+    of the underlying data (e.g. a DNS record TTL) instead of a fixed constant.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._cache = TLRUCache(maxsize=maxsize, ttu=lambda _key, entry, now: now + entry[0])
+        if name in _registry:
+            raise ValueError(f"Lookup cache '{name}' already exists")
+        _registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key, expiring after ttl seconds (default: cache TTL)"""
+        with self._lock:
+            self._cache[key] = (self.ttl if ttl is None else ttl, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current size and hit ratio of this cache"""
+        with self._lock:
+            self._cache.expire()
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+async def single_flight(key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+    """
+    Coalesce concurrent identical lookups: the first caller for a key runs
+    factory(), later callers await the same result instead of repeating it.
+
+    Args:
+        key: Identity of the lookup
+        factory: Zero-argument callable returning the awaitable to run
+
+    Returns:
+        The shared result (exceptions propagate to every caller)
+    """
+    inflight = _inflight.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        inflight[key] = task
+        task.add_done_callback(lambda _task: inflight.pop(key, None))
+    # Shield so one caller being cancelled doesn't cancel the shared lookup
+    return await asyncio.shield(task)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics for every lookup cache in this process"""
+    return {name: cache.stats() for name, cache in _registry.items()}
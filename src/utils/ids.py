@@ -0,0 +1,23 @@
+"""
+ID generation for ExposeChain
+"""
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (version 7, RFC 9562)
+
+    The leading 48 bits are the Unix time in milliseconds, so IDs sort by
+    creation time and stay append-only when used as an index key.
+
+    Returns:
+        A new UUIDv7
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # Set version (7) and variant (0b10) bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return uuid.UUID(int=value)
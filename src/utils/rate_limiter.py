@@ -3,5 +3,14 @@ Rate limiter configuration for ExposeChain
 """
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from src.config import settings
 
-limiter = Limiter(key_func=get_remote_address)
+# With a shared backend (redis://) limits hold across workers and replicas;
+# if it becomes unreachable, fall back to per-process counters rather than failing requests
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,
+    enabled=settings.RATE_LIMIT_ENABLED
+)
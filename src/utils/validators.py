@@ -1,11 +1,18 @@
 """
 Utility functions for input detection and validation
 """
+import re
 import socket
 import ipaddress
-import validators
 from typing import Literal
 
+# Same rules as validators.domain() (default options), compiled once
+_DOMAIN_RE = re.compile(
+    r"^(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9][a-z0-9-_]{0,61}[a-z]$",
+    re.IGNORECASE
+)
+_DOMAIN_BAD_CHARS_RE = re.compile(r"\s|__+")
+
 
 def detect_target_type(target: str) -> Literal["domain"]:
     """
@@ -20,6 +27,27 @@ def detect_target_type(target: str) -> Literal["domain"]:
     return "domain"
 
 
+def is_valid_domain(value: str) -> bool:
+    """
+    Check if a string is a syntactically valid domain name (IDN allowed)
+
+    Args:
+        value: The domain to validate
+
+    Returns:
+        True if valid domain, False otherwise
+    """
+    if not value or _DOMAIN_BAD_CHARS_RE.search(value):
+        return False
+    if not value.isascii():
+        # Internationalized names are validated in their punycode form
+        try:
+            value = value.encode("idna").decode("utf-8")
+        except UnicodeError:
+            return False
+    return _DOMAIN_RE.match(value) is not None
+
+
 def is_valid_target(target: str) -> bool:
     """
     Check if a target is a valid domain name
@@ -31,7 +59,7 @@ def is_valid_target(target: str) -> bool:
         True if valid domain, False otherwise
     """
     target = target.strip().lower()
-    return validators.domain(target) is True
+    return is_valid_domain(target)
 
 
 def is_private_ip(hostname: str) -> bool:
@@ -0,0 +1,8 @@
+"""
+Shared pytest setup for ExposeChain
+"""
+import os
+import sys
+
+# Make the `src` package importable however pytest is invoked
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,141 @@
+"""
+Regression tests for the AI risk predictor (src/services/ai_service.py)
+
+fixtures/ai_golden.json records the predictor's output for a fixed set of
+synthetic scans. Regenerate it (only for intended scoring changes) with:
+    python tests/test_ai_service.py
+"""
+import hashlib
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from src.services import AIRiskPredictor
+
+FIXTURE = Path(__file__).parent / "fixtures" / "ai_golden.json"
+SCAN_COUNT = 1000
+SEED = 1234
+
+
+def _synthetic_scan(rng: random.Random) -> dict:
+    """Random scan_data shaped like the /api/scan pipeline output"""
+    data = {}
+    if rng.random() < 0.8:
+        whois = {
+            "success": rng.random() < 0.9,
+            "registrant": {"name": rng.choice([None, "Privacy Guard", "Jane", "REDACTED FOR PRIVACY"])},
+        }
+        if rng.random() < 0.85:
+            whois["domain_age_days"] = rng.choice([0, 5, 29, 30, 100, 179, 180, 300, 364, 365, 400, 4000])
+        if rng.random() < 0.8:
+            whois["days_until_expiration"] = rng.choice([-5, -1, 0, 1, 29, 30, 60, 89, 90, 500])
+        if rng.random() < 0.1:
+            whois["registrant"] = {}
+        data["whois_lookup"] = whois
+    if rng.random() < 0.8:
+        data["domain_analysis"] = {"status": rng.choice(["active", "expired", "expiring_soon", "unknown"])}
+    if rng.random() < 0.9:
+        data["ssl_certificate"] = {"success": rng.random() < 0.8}
+    if data.get("ssl_certificate", {}).get("success"):
+        analysis = {
+            "security_score": rng.choice([0, 40, 69, 70, 85, 99, 100]),
+            "risk_level": rng.choice(["low", "high"]),
+        }
+        if rng.random() < 0.9:
+            analysis["details"] = {
+                "protocol_version": rng.choice(["TLSv1.3", "TLSv1.2", "TLSv1", "TLSv1.1", "SSLv3", ""]),
+                "key_type": "RSA",
+                "key_strength": "strong",
+                "expires_in_days": rng.choice([None, -3, 0, 6, 7, 20, 29, 30, 200]),
+                "is_valid": True,
+            }
+        data["ssl_security_analysis"] = analysis
+    if rng.random() < 0.7:
+        locations = {}
+        for i in range(rng.randint(0, 6)):
+            if rng.random() < 0.9:
+                locations[f"1.1.1.{i}"] = {"success": rng.random() < 0.8, "flags": {"is_proxy": rng.random() < 0.3}}
+            else:
+                locations[f"1.1.1.{i}"] = {"success": True}
+        data["geolocation"] = {"total_ips": len(locations), "ip_locations": locations}
+        data["hosting_analysis"] = {
+            "is_cdn": rng.random() < 0.5,
+            "pattern": "x",
+            "countries": ["US"] * rng.randint(0, 3),
+            "hosting_provider_count": rng.randint(0, 3),
+        }
+    if rng.random() < 0.9:
+        records = {}
+        for record_type in ["A", "MX", "NS", "TXT"]:
+            if rng.random() < 0.85:
+                records[record_type] = {"success": rng.random() < 0.8, "count": rng.randint(0, 5)}
+        if "TXT" in records and rng.random() < 0.9:
+            pool = [
+                "v=spf1 include:_spf.google.com ~all", "V=DMARC1; p=none", "google-site-verification=abc",
+                "_dmarc.example.com", "hello", "",
+            ]
+            records["TXT"]["records"] = [{"data": rng.choice(pool)} for _ in range(rng.randint(0, 4))]
+        data["dns_lookup"] = {"dns_records": records}
+    return data
+
+
+def _fingerprint(result: dict) -> list:
+    """Headline fields plus a digest of the full result (minus the timestamp)"""
+    result = {key: value for key, value in result.items() if key != "analyzed_at"}
+    digest = hashlib.sha256(json.dumps(result, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return [
+        result["overall_risk_score"], result["threat_level"], result["threat_category"],
+        result["confidence"], digest,
+    ]
+
+
+def _fingerprints(predictor) -> list:
+    rng = random.Random(SEED)
+    return [_fingerprint(predictor.analyze(_synthetic_scan(rng))) for _ in range(SCAN_COUNT)]
+
+
+def test_matches_recorded_results():
+    expected = json.loads(FIXTURE.read_text())
+    actual = _fingerprints(AIRiskPredictor())
+    mismatches = [i for i, (got, want) in enumerate(zip(actual, expected)) if got != want]
+    assert len(actual) == len(expected)
+    assert mismatches == [], f"{len(mismatches)} scans differ, first: scan {mismatches[0]}"
+
+
+@pytest.mark.parametrize("score", range(0, 101))
+def test_score_bands(score, monkeypatch):
+    predictor = AIRiskPredictor()
+    monkeypatch.setattr(predictor, "_calculate_score", lambda features: (score, []))
+    # Long-established domain with SSL, so no heuristic category override applies
+    result = predictor.analyze({
+        "whois_lookup": {"success": True, "domain_age_days": 4000},
+        "ssl_certificate": {"success": True},
+        "ssl_security_analysis": {"security_score": 100},
+    })
+
+    level = "low" if score <= 20 else "medium" if score <= 45 else "high" if score <= 70 else "critical"
+    category = (
+        "legitimate" if score <= 20
+        else "suspicious" if score <= 50
+        else "malware_hosting" if score <= 75
+        else "phishing"
+    )
+    assert result["threat_level"] == level
+    assert result["threat_category"] == category
+
+
+def test_factor_records_are_not_shared():
+    predictor = AIRiskPredictor()
+    first = predictor.analyze({})
+    for factor in first["threats_detected"]:
+        factor["points"] = -1
+    second = predictor.analyze({})
+    assert all(factor["points"] > 0 for factor in second["threats_detected"])
+
+
+if __name__ == "__main__":
+    FIXTURE.parent.mkdir(exist_ok=True)
+    FIXTURE.write_text(json.dumps(_fingerprints(AIRiskPredictor())) + "\n")
+    print(f"Wrote {SCAN_COUNT} results to {FIXTURE}")
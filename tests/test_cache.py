@@ -0,0 +1,197 @@
+"""
+Tests for the lookup caches (src/utils/cache.py) and /api/cache/stats
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from src.api import routes
+from src.config import settings
+from src.main import app
+from src.utils.cache import LookupCache, _inflight, get_cache_stats, single_flight
+from src.utils.rate_limiter import limiter
+
+
+def test_get_set_and_stats():
+    cache = LookupCache("test-basic", maxsize=10, ttl=60)
+
+    assert cache.get("missing") is None
+    cache.set("key", {"value": 1})
+    assert cache.get("key") == {"value": 1}
+
+    stats = cache.stats()
+    assert stats["size"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert get_cache_stats()["test-basic"] == stats
+
+
+def test_duplicate_cache_name_is_rejected():
+    with pytest.raises(ValueError):
+        LookupCache("dns", maxsize=10, ttl=60)
+
+
+def test_entry_ttl_overrides_cache_ttl():
+    cache = LookupCache("test-entry-ttl", maxsize=10, ttl=60)
+    cache.set("short", "a", ttl=0.05)
+    cache.set("default", "b")
+
+    time.sleep(0.15)
+
+    assert cache.get("short") is None
+    assert cache.get("default") == "b"
+
+
+def test_zero_ttl_is_not_stored():
+    cache = LookupCache("test-zero-ttl", maxsize=10, ttl=0)
+    cache.set("key", "value")
+    cache.set("other", "value", ttl=0)
+
+    assert cache.get("key") is None
+    assert cache.get("other") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_failed_lookups_use_negative_ttl(monkeypatch):
+    service = routes.geo_service
+    stored = {}
+    monkeypatch.setattr(service._cache, "set", lambda key, value, ttl=None: stored.update({key: ttl}))
+
+    async def fake_fetch(ip_address):
+        return {"success": ip_address == "192.0.2.1", "ip": ip_address}
+
+    monkeypatch.setattr(service, "_fetch_ip_location", fake_fetch)
+    asyncio.run(service.lookup_ip_location("192.0.2.1"))
+    asyncio.run(service.lookup_ip_location("192.0.2.2"))
+
+    assert stored == {"geo:192.0.2.1": None, "geo:192.0.2.2": settings.NEGATIVE_CACHE_TTL}
+
+
+def test_dns_lookups_where_nothing_resolved_use_negative_ttl():
+    failed = {"success": False, "records": []}
+
+    assert routes.dns_service._cache_ttl({"dns_records": {"A": failed, "MX": failed}}) == settings.NEGATIVE_CACHE_TTL
+    assert routes.dns_service._cache_ttl({"dns_records": {}, "reverse_dns": {"success": False}}) == (
+        settings.NEGATIVE_CACHE_TTL
+    )
+
+
+def test_dns_cache_ttl_follows_lowest_record_ttl():
+    def results(*record_sets):
+        return {"dns_records": {str(i): record_set for i, record_set in enumerate(record_sets)}}
+
+    failed = {"success": False, "records": []}
+    answered = {"success": True, "records": [{"ip": "1.1.1.1", "ttl": 120}, {"ip": "1.0.0.1", "ttl": 60}]}
+    long_lived = {"success": True, "records": [{"ip": "1.1.1.1", "ttl": 10 ** 6}]}
+
+    assert routes.dns_service._cache_ttl(results(answered, failed)) == 60
+    # Capped at DNS_CACHE_TTL
+    assert routes.dns_service._cache_ttl(results(long_lived)) == settings.DNS_CACHE_TTL
+
+
+def test_single_flight_shares_one_run():
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"result": len(calls)}
+
+    async def main():
+        results = await asyncio.gather(*(single_flight("shared", lookup) for _ in range(5)))
+        assert "shared" not in _inflight[asyncio.get_running_loop()]
+        # Once finished, the next caller runs the lookup again
+        results.append(await single_flight("shared", lookup))
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 2
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] == {"result": 2}
+
+
+def test_single_flight_propagates_exceptions():
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("lookup failed")
+
+    async def main():
+        results = await asyncio.gather(
+            *(single_flight("failing", lookup) for _ in range(3)), return_exceptions=True
+        )
+        assert "failing" not in _inflight[asyncio.get_running_loop()]
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_single_flight_cancelled_caller_does_not_cancel_lookup():
+    async def lookup():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        first = asyncio.create_task(single_flight("shielded", lookup))
+        second = asyncio.create_task(single_flight("shielded", lookup))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_single_flight_is_per_event_loop():
+    started = threading.Event()
+    calls = []
+
+    async def lookup():
+        calls.append(threading.current_thread().name)
+        started.set()
+        await asyncio.sleep(0.1)
+        return threading.current_thread().name
+
+    # Same key in flight on another thread's loop must not be awaited from this one
+    other = threading.Thread(target=lambda: asyncio.run(single_flight("per-loop", lookup)), name="other-loop")
+    other.start()
+    started.wait()
+    result = asyncio.run(single_flight("per-loop", lookup))
+    other.join()
+
+    assert result == threading.current_thread().name
+    assert len(calls) == 2
+
+
+def _get_cache_stats():
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/cache/stats")
+    return asyncio.run(main())
+
+
+def test_cache_stats_endpoint_is_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(limiter, "enabled", False)
+    monkeypatch.setattr(settings, "CACHE_STATS_ENABLED", False)
+
+    assert _get_cache_stats().status_code == 404
+
+
+def test_cache_stats_endpoint(monkeypatch):
+    monkeypatch.setattr(limiter, "enabled", False)
+    monkeypatch.setattr(settings, "CACHE_STATS_ENABLED", True)
+
+    response = _get_cache_stats()
+
+    assert response.status_code == 200
+    assert {"dns", "whois", "geo", "ssl", "scan"} <= set(response.json()["caches"])
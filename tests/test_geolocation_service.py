@@ -0,0 +1,72 @@
+"""
+Tests for the geolocation service's pooled client across event loops
+(src/services/geolocation_service.py)
+"""
+import asyncio
+import threading
+
+import pytest
+
+from src.api import routes
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """The geolocation singleton with a fresh client pool (restored afterwards)"""
+    service = routes.geo_service
+    for name, value in (("_client", None), ("_lookup_slots", None), ("_loop", None), ("_stale_clients", [])):
+        monkeypatch.setattr(service, name, value)
+    return service
+
+
+async def _current_client(service):
+    return service.client
+
+
+def test_concurrent_lookups_work_on_a_second_event_loop(service, monkeypatch):
+    async def fake_lookup(ip_address):
+        await asyncio.sleep(0.01)
+        return {"success": True, "ip": ip_address}
+
+    monkeypatch.setattr(service, "lookup_ip_location", fake_lookup)
+    dns_results = {"dns_records": {"A": {"success": True, "records": [{"ip": f"192.0.2.{i}"} for i in range(30)]}}}
+
+    # More IPs than lookup slots, so the semaphore has to be waited on in both loops
+    for _ in range(2):
+        assert asyncio.run(service.lookup_domain_ips(dns_results))["total_ips"] == 30
+
+
+def test_client_from_a_finished_loop_is_released_by_aclose(service):
+    old = asyncio.run(_current_client(service))
+
+    async def replace_and_close():
+        new = service.client
+        await service.aclose()
+        return new
+
+    new = asyncio.run(replace_and_close())
+
+    assert new is not old
+    assert old.is_closed and new.is_closed
+    assert service._stale_clients == []
+
+
+def test_client_from_a_running_loop_is_closed_on_that_loop(service):
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    try:
+        old = asyncio.run_coroutine_threadsafe(_current_client(service), other_loop).result()
+
+        async def replace():
+            service.client
+            # Let the other loop run the close it was handed
+            await asyncio.sleep(0.05)
+            await service.aclose()
+
+        asyncio.run(replace())
+        assert old.is_closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
@@ -0,0 +1,90 @@
+"""
+Tests for /api/scan caching and coalescing (src/api/routes.py)
+The scan pipeline itself is replaced by a stub, so no network access is needed.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from src.api import routes
+from src.main import app
+from src.utils import validators
+from src.utils.ids import uuid7
+from src.utils.rate_limiter import limiter
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Stubbed _run_scan; returns the list of (target, scan_type) it was called with"""
+    calls = []
+
+    async def fake_run_scan(target, scan_type):
+        calls.append((target, scan_type))
+        await asyncio.sleep(0.05)
+        return {
+            "scan_id": str(uuid7()),
+            "target": target,
+            "scan_type": scan_type,
+            "ssl_certificate": {"success": not target.startswith("nossl.")},
+        }
+
+    monkeypatch.setattr(routes, "_run_scan", fake_run_scan)
+    monkeypatch.setattr(validators, "is_private_ip", lambda hostname: False)
+    monkeypatch.setattr(limiter, "enabled", False)
+    monkeypatch.setattr(routes.settings, "SCAN_CACHE_MODE", "enabled")
+    return calls
+
+
+def _post_scans(*targets):
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.post("/api/scan", json={"target": t}) for t in targets))
+    return asyncio.run(main())
+
+
+def test_concurrent_identical_scans_share_one_run(pipeline, monkeypatch):
+    monkeypatch.setattr(routes.settings, "SCAN_CACHE_MODE", "disabled")
+
+    responses = _post_scans(*["coalesce.example.com"] * 5)
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert pipeline == [("coalesce.example.com", "quick")]
+    assert len({response.json()["data"]["scan_id"] for response in responses}) == 1
+
+
+def test_different_targets_run_separately(pipeline, monkeypatch):
+    monkeypatch.setattr(routes.settings, "SCAN_CACHE_MODE", "disabled")
+
+    _post_scans("one.example.com", "two.example.com")
+
+    assert sorted(pipeline) == [("one.example.com", "quick"), ("two.example.com", "quick")]
+
+
+def test_recent_scan_is_served_from_cache(pipeline):
+    first, = _post_scans("cached.example.com")
+    second, = _post_scans("cached.example.com")
+
+    assert len(pipeline) == 1
+    assert first.json()["data"]["scan_id"] == second.json()["data"]["scan_id"]
+
+
+def test_scan_without_ssl_is_cached_briefly(pipeline, monkeypatch):
+    ttls = {}
+    monkeypatch.setattr(routes.scan_cache, "set", lambda key, value, ttl=None: ttls.update({value["target"]: ttl}))
+
+    _post_scans("nossl.example.com", "withssl.example.com")
+
+    assert ttls == {"nossl.example.com": routes.settings.NEGATIVE_CACHE_TTL, "withssl.example.com": None}
+
+
+def test_replay_mode_only_serves_cached_scans(pipeline, monkeypatch):
+    _post_scans("replayed.example.com")
+    monkeypatch.setattr(routes.settings, "SCAN_CACHE_MODE", "replay")
+
+    hit, miss = _post_scans("replayed.example.com", "uncached.example.com")
+
+    assert hit.status_code == 200
+    assert miss.status_code == 404
+    assert len(pipeline) == 1
@@ -0,0 +1,66 @@
+"""
+Tests for domain validation (src/utils/validators.py)
+"""
+import random
+
+import pytest
+
+from src.utils.validators import is_valid_domain, is_valid_target
+
+
+@pytest.mark.parametrize("value", [
+    "example.com",
+    "sub.example.co.uk",
+    "EXAMPLE.COM",
+    "a-b.example.com",
+    "example.c0m",
+    "xn--bcher-kva.example",
+    "bücher.example",
+    "a" * 63 + ".com",
+])
+def test_valid_domains(value):
+    assert is_valid_domain(value)
+
+
+@pytest.mark.parametrize("value", [
+    "",
+    "localhost",
+    "example",
+    "-a.com",
+    "a-.com",
+    "ex_ample.com",
+    "_dmarc.example.com",
+    "a__b.com",
+    "exa mple.com",
+    " example.com",
+    "ex!ample.com",
+    "1.2.3.4",
+    "example.123",
+    "example.com.",
+    ".example.com",
+    "example..com",
+    "a" * 64 + ".com",
+])
+def test_invalid_domains(value):
+    assert not is_valid_domain(value)
+
+
+def test_valid_target_is_normalized():
+    assert is_valid_target("  Example.COM ")
+    assert not is_valid_target("https://example.com")
+
+
+def test_matches_validators_package():
+    """is_valid_domain replaced validators.domain() and must accept exactly the same inputs"""
+    validators = pytest.importorskip("validators")
+    rng = random.Random(1234)
+    alphabet = "abcxyz019-_. " + "üé"
+    samples = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24))) for _ in range(300)]
+    # Mostly well-formed names, so both results get exercised
+    samples += [
+        ".".join("".join(rng.choice("abz09-") for _ in range(rng.randint(1, 8))) for _ in range(rng.randint(1, 4)))
+        for _ in range(300)
+    ]
+
+    mismatches = [value for value in samples if is_valid_domain(value) != bool(validators.domain(value))]
+    assert mismatches == []